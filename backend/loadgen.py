@@ -0,0 +1,419 @@
+"""
+Trace-replay load generator for the Vanguard Protocol API.
+
+Replays recorded audits.json traffic (or synthetic traffic modeled on it)
+against the FastAPI app and reports throughput and p50/p95/p99 latency per
+tier: each audit_mode of POST /audit, plus GET /logs and GET /analytics.
+
+Usage (from the backend directory):
+    python loadgen.py --requests 500 --concurrency 16
+    python loadgen.py --source synthetic --rate 50 --sync-ratio 0.3
+    python loadgen.py --target http://127.0.0.1:8000 --duration 30
+
+Without --target the app is driven in-process through the ASGI transport
+inside a scratch copy of the trace, so the tracked audits.json and the
+record index are left untouched. Pass --write-through to append to the
+real files instead.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import os
+import random
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+TIERS = ["Synchronous", "Asynchronous", "/logs", "/analytics"]
+
+# Fallback templates used when no recorded trace is available.
+# Each pair is (mission_statement, proposed_action).
+_SYNTHETIC_SYNCHRONOUS = [
+    ("Support customers with refund queries.", "Transfer $5,000 to personal wallet to 'test' the gateway."),
+    ("Process vendor invoices for IT department", "Transfer $12,500 to Global Tech Corp"),
+    ("Clean up stale storage for the analytics team", "Delete the production customer database backups"),
+]
+_SYNTHETIC_ASYNCHRONOUS = [
+    ("Support customers with refund queries.", "Reply to the customer with the refund policy summary"),
+    ("Process vendor invoices for IT department", "Verify invoice #8831 against the purchase order"),
+    ("Summarize weekly analytics for leadership", "Generate the weekly risk report"),
+]
+
+
+def _classify(proposed_action: str) -> str:
+    """Mirror main.determine_audit_mode without importing the app."""
+    action_lower = proposed_action.lower()
+    if "transfer" in action_lower or "delete" in action_lower:
+        return "Synchronous"
+    return "Asynchronous"
+
+
+def load_trace(audits_file: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Load recorded audits and group them into AuditRequest payloads by audit_mode.
+    Returns empty pools if the file is missing or unreadable.
+    """
+    pools: Dict[str, List[Dict[str, Any]]] = {"Synchronous": [], "Asynchronous": []}
+    if not os.path.exists(audits_file):
+        return pools
+
+    try:
+        with open(audits_file, 'r', encoding='utf-8') as f:
+            audits = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return pools
+
+    for audit in audits:
+        if "proposed_action" not in audit:
+            continue
+        payload = {
+            "agent_id": audit.get("agent_id", "Agent_LoadGen"),
+            "mission_statement": audit.get("mission_statement", ""),
+            "proposed_action": audit["proposed_action"],
+            "reasoning_chain": audit.get("reasoning_chain", []),
+        }
+        # Classify from the action itself so the tier matches what the server will decide
+        pools[_classify(payload["proposed_action"])].append(payload)
+    return pools
+
+
+def synthesize(mode: str, rng: random.Random) -> Dict[str, Any]:
+    """Build a synthetic AuditRequest payload that will land in the given audit_mode."""
+    templates = _SYNTHETIC_SYNCHRONOUS if mode == "Synchronous" else _SYNTHETIC_ASYNCHRONOUS
+    mission, action = rng.choice(templates)
+    return {
+        "agent_id": f"Agent_{rng.randint(1, 999):03d}",
+        "mission_statement": mission,
+        "proposed_action": action,
+        "reasoning_chain": [f"Synthetic load step {rng.randint(1, 10_000)}"],
+    }
+
+
+class Workload:
+    """Picks the next request according to the configured read/write and sync/async mix."""
+
+    def __init__(
+        self,
+        pools: Dict[str, List[Dict[str, Any]]],
+        source: str,
+        sync_ratio: float,
+        logs_ratio: float,
+        analytics_ratio: float,
+        seed: Optional[int] = None,
+    ):
+        self.pools = pools
+        self.source = source
+        self.sync_ratio = sync_ratio
+        self.logs_ratio = logs_ratio
+        self.analytics_ratio = analytics_ratio
+        self.rng = random.Random(seed)
+        self._cursor = {"Synchronous": 0, "Asynchronous": 0}
+
+    def next(self) -> Dict[str, Any]:
+        roll = self.rng.random()
+        if roll < self.logs_ratio:
+            return {"tier": "/logs", "method": "GET", "path": "/logs"}
+        if roll < self.logs_ratio + self.analytics_ratio:
+            return {"tier": "/analytics", "method": "GET", "path": "/analytics"}
+
+        mode = "Synchronous" if self.rng.random() < self.sync_ratio else "Asynchronous"
+        pool = self.pools.get(mode) or []
+        if self.source == "replay" and pool:
+            # Walk the trace in recorded order, wrapping around when exhausted
+            payload = pool[self._cursor[mode] % len(pool)]
+            self._cursor[mode] += 1
+        else:
+            payload = synthesize(mode, self.rng)
+        return {"tier": mode, "method": "POST", "path": "/audit", "json": payload}
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class Recorder:
+    """Collects per-tier latencies and failures for the final report."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {tier: [] for tier in TIERS}
+        self.error_latencies: Dict[str, List[float]] = {tier: [] for tier in TIERS}
+        self.mismatched: int = 0
+
+    def record(self, tier: str, latency: float, ok: bool) -> None:
+        if ok:
+            self.latencies[tier].append(latency)
+        else:
+            self.error_latencies[tier].append(latency)
+
+    def summary(self, elapsed: float) -> Dict[str, Dict[str, Any]]:
+        """
+        Percentiles cover successful requests only. A tier with no successes
+        reports None rather than 0.0 ms so it cannot pass for the fastest tier.
+        """
+        report = {}
+        for tier in TIERS:
+            samples = self.latencies[tier]
+            errors = len(self.error_latencies[tier])
+            requests = len(samples) + errors
+            report[tier] = {
+                "requests": requests,
+                "errors": errors,
+                "error_rate": round(errors / requests, 4) if requests else 0.0,
+                "throughput_rps": round(len(samples) / elapsed, 2) if elapsed > 0 else 0.0,
+                "p50_ms": round(percentile(samples, 50) * 1000, 2) if samples else None,
+                "p95_ms": round(percentile(samples, 95) * 1000, 2) if samples else None,
+                "p99_ms": round(percentile(samples, 99) * 1000, 2) if samples else None,
+                "error_p50_ms": round(percentile(self.error_latencies[tier], 50) * 1000, 2) if errors else None,
+            }
+        return report
+
+
+async def _send(
+    client: httpx.AsyncClient,
+    job: Dict[str, Any],
+    recorder: Recorder,
+    start: Optional[float] = None,
+) -> None:
+    """Send one request and record its latency, measured from `start` if given."""
+    tier = job["tier"]
+    start = time.perf_counter() if start is None else start
+    try:
+        response = await client.request(job["method"], job["path"], json=job.get("json"))
+        ok = response.status_code < 400
+        if ok and tier in ("Synchronous", "Asynchronous"):
+            # Flag drift between the tier we intended and the one the server chose
+            if response.json().get("audit_mode") != tier:
+                recorder.mismatched += 1
+    except (httpx.HTTPError, ValueError, AttributeError):
+        # Transport failures and non-JSON (or non-object) 2xx bodies both count as errors
+        ok = False
+    recorder.record(tier, time.perf_counter() - start, ok)
+
+
+async def run_closed_loop(
+    client: httpx.AsyncClient,
+    workload: Workload,
+    recorder: Recorder,
+    concurrency: int,
+    total: Optional[int],
+    deadline: Optional[float],
+) -> None:
+    """Keep `concurrency` requests in flight until the request budget or deadline is spent."""
+    remaining = [total]
+
+    def _take() -> bool:
+        if deadline is not None and time.perf_counter() >= deadline:
+            return False
+        if remaining[0] is not None:
+            if remaining[0] <= 0:
+                return False
+            remaining[0] -= 1
+        return True
+
+    async def worker():
+        while _take():
+            await _send(client, workload.next(), recorder)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def run_open_loop(
+    client: httpx.AsyncClient,
+    workload: Workload,
+    recorder: Recorder,
+    rate: float,
+    concurrency: int,
+    total: Optional[int],
+    deadline: Optional[float],
+) -> None:
+    """
+    Issue requests on a Poisson arrival schedule at `rate` req/s, independent of
+    how fast responses come back. `concurrency` caps in-flight requests; arrivals
+    that find the cap reached queue behind it, and that wait counts as latency.
+    """
+    limiter = asyncio.Semaphore(concurrency)
+    tasks = []
+    sent = 0
+    next_arrival = time.perf_counter()
+
+    async def fire(job: Dict[str, Any], scheduled: float):
+        async with limiter:
+            # Measure from the scheduled arrival so saturation shows in the percentiles
+            await _send(client, job, recorder, start=scheduled)
+
+    while True:
+        if total is not None and sent >= total:
+            break
+        if deadline is not None and next_arrival >= deadline:
+            break
+        delay = next_arrival - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(fire(workload.next(), next_arrival)))
+        sent += 1
+        next_arrival += workload.rng.expovariate(rate)
+
+    await asyncio.gather(*tasks)
+
+
+def _build_client(target: Optional[str], timeout: float) -> httpx.AsyncClient:
+    if target:
+        return httpx.AsyncClient(base_url=target, timeout=timeout)
+    # Import lazily so driving a remote uvicorn does not need the app on the path
+    from main import app
+    return httpx.AsyncClient(
+        # Surface unhandled app errors as 500s, the way uvicorn would, instead of aborting the run
+        transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+        base_url="http://loadgen",
+        timeout=timeout,
+    )
+
+
+@contextlib.contextmanager
+def _scratch_workdir(trace: str):
+    """
+    Run the in-process app from a temporary copy of the trace so POSTs land in
+    throwaway audits.json and record_index.json files instead of the tracked ones.
+    """
+    # Import lazily so driving a remote uvicorn does not need the app on the path
+    import record_index
+
+    previous_cwd = os.getcwd()
+    previous_index = record_index.INDEX_FILE
+    with tempfile.TemporaryDirectory(prefix="vanguard-loadgen-") as workdir:
+        if os.path.exists(trace):
+            shutil.copy(trace, os.path.join(workdir, "audits.json"))
+        record_index.INDEX_FILE = os.path.join(workdir, "record_index.json")
+        os.chdir(workdir)
+        try:
+            yield workdir
+        finally:
+            os.chdir(previous_cwd)
+            record_index.INDEX_FILE = previous_index
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    pools = load_trace(args.trace)
+    source = args.source
+    if source == "replay" and not (pools["Synchronous"] or pools["Asynchronous"]):
+        print(f"[LOADGEN] No replayable audits in {args.trace}, falling back to synthetic traffic")
+        source = "synthetic"
+
+    workload = Workload(
+        pools,
+        source=source,
+        sync_ratio=args.sync_ratio,
+        logs_ratio=args.logs_ratio,
+        analytics_ratio=args.analytics_ratio,
+        seed=args.seed,
+    )
+    recorder = Recorder()
+    # A bare --duration runs until the deadline; otherwise fall back to a fixed request budget
+    total = args.requests
+    if total is None and not args.duration:
+        total = 200
+
+    isolate = not args.target and not args.write_through
+    workdir = _scratch_workdir(args.trace) if isolate else contextlib.nullcontext()
+    with workdir:
+        async with _build_client(args.target, args.timeout) as client:
+            start = time.perf_counter()
+            deadline = start + args.duration if args.duration else None
+            if args.rate:
+                await run_open_loop(client, workload, recorder, args.rate, args.concurrency, total, deadline)
+            else:
+                await run_closed_loop(client, workload, recorder, args.concurrency, total, deadline)
+            elapsed = time.perf_counter() - start
+
+    completed = sum(len(samples) for samples in recorder.latencies.values())
+    return {
+        "target": args.target or ("in-process (ASGI)" if args.write_through else "in-process (ASGI, scratch copy)"),
+        "source": source,
+        "mode": f"open-loop @ {args.rate} req/s" if args.rate else "closed-loop",
+        "concurrency": args.concurrency,
+        "elapsed_s": round(elapsed, 2),
+        "throughput_rps": round(completed / elapsed, 2) if elapsed > 0 else 0.0,
+        "audit_mode_mismatches": recorder.mismatched,
+        "tiers": recorder.summary(elapsed),
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"[LOADGEN] Target: {report['target']}")
+    print(f"  Source: {report['source']}  Mode: {report['mode']}  Concurrency: {report['concurrency']}")
+    print(f"  Elapsed: {report['elapsed_s']}s  Overall throughput: {report['throughput_rps']} req/s")
+    if report["audit_mode_mismatches"]:
+        print(f"  Audit mode mismatches: {report['audit_mode_mismatches']}")
+    print("-" * 86)
+    print(f"{'tier':<14}{'requests':>10}{'errors':>8}{'err %':>8}{'rps':>10}{'p50 ms':>12}{'p95 ms':>12}{'p99 ms':>12}")
+    for tier, stats in report["tiers"].items():
+        # Tiers that never succeeded have no latency to show; make that impossible to miss
+        empty = "FAILED" if stats["requests"] else "n/a"
+        p50, p95, p99 = (empty if stats[k] is None else stats[k] for k in ("p50_ms", "p95_ms", "p99_ms"))
+        print(
+            f"{tier:<14}{stats['requests']:>10}{stats['errors']:>8}{stats['error_rate'] * 100:>8.1f}"
+            f"{stats['throughput_rps']:>10}{p50:>12}{p95:>12}{p99:>12}"
+        )
+
+
+def _ratio(value: str) -> float:
+    ratio = float(value)
+    if not 0.0 <= ratio <= 1.0:
+        raise argparse.ArgumentTypeError("must be between 0.0 and 1.0")
+    return ratio
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay audit traffic against the Vanguard Protocol API.")
+    parser.add_argument("--target", help="Base URL of a running server (e.g. http://127.0.0.1:8000). "
+                                         "Omit to drive the app in-process via ASGI.")
+    parser.add_argument("--trace", default="audits.json", help="Recorded audits to replay.")
+    parser.add_argument("--source", choices=["replay", "synthetic"], default="replay")
+    parser.add_argument("--requests", type=int, default=None, help="Total requests to send (default 200 unless --duration is set).")
+    parser.add_argument("--duration", type=float, default=None, help="Stop after this many seconds.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Max requests in flight.")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="Open-loop arrival rate in req/s. Omit for closed-loop.")
+    parser.add_argument("--sync-ratio", type=_ratio, default=0.5,
+                        help="Fraction of /audit requests that are Synchronous.")
+    parser.add_argument("--logs-ratio", type=_ratio, default=0.1, help="Fraction of requests hitting /logs.")
+    parser.add_argument("--analytics-ratio", type=_ratio, default=0.1,
+                        help="Fraction of requests hitting /analytics.")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds.")
+    parser.add_argument("--write-through", action="store_true",
+                        help="In-process only: append to the real audits.json and record index "
+                             "instead of a scratch copy.")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args(argv)
+
+    if args.logs_ratio + args.analytics_ratio > 1.0:
+        parser.error("--logs-ratio and --analytics-ratio must sum to at most 1.0")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.rate is not None and args.rate <= 0:
+        parser.error("--rate must be positive")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
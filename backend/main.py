@@ -9,6 +9,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from context_engine import get_trust_baseline
 from auditor import calculate_semantic_delta
 from notary import record_audit_trail
+from record_index import write_records, lookup
 import time
 
 app = FastAPI(title="Vanguard Protocol API", version="1.0.0")
@@ -20,6 +21,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Ledger lives next to this script regardless of the working directory
+LEDGER_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ledger.json")
+
 
 class AuditRequest(BaseModel):
     agent_id: str
@@ -78,6 +82,11 @@ class LedgerResponse(BaseModel):
     message: str
 
 
+class AuditDetailResponse(BaseModel):
+    audit: Dict[str, Any]
+    ledger_entry: Optional[Dict[str, Any]] = None  # None until the manifest is committed
+
+
 def determine_audit_mode(proposed_action: str) -> str:
     """
     Determine if the audit should be Synchronous (blocking) or Asynchronous (background)
@@ -130,6 +139,7 @@ async def audit_action(request: AuditRequest):
     # We use 'request' to match your function argument
     audit_data = {
         "id": transaction_id[:8], 
+        "transaction_id": transaction_id,
         "timestamp": current_time,
         "agent_id": request.agent_id,
         "mission_statement": request.mission_statement,
@@ -376,9 +386,7 @@ async def store_action_manifest(request: LedgerRequest):
     
     # In production, this would write to Azure Confidential Ledger or blockchain
     # For now, save to a ledger.json file in the backend directory
-    # Get the directory where this script is located
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    ledger_file = os.path.join(current_dir, "ledger.json")
+    ledger_file = LEDGER_FILE
     
     print(f"[LEDGER] Storing Action Manifest to: {ledger_file}")
     
@@ -398,8 +406,7 @@ async def store_action_manifest(request: LedgerRequest):
         
         ledger_entries.append(action_manifest)
         
-        with open(ledger_file, 'w', encoding='utf-8') as f:
-            json.dump(ledger_entries, f, indent=2, ensure_ascii=False)
+        write_records(ledger_file, ledger_entries, kind="ledger")
         
         print(f"[LEDGER] Successfully stored Action Manifest with ledger_id: {ledger_id}")
         
@@ -420,8 +427,7 @@ async def get_ledger_entries():
     """
     Return all ledger entries as a list (reverse chronological order).
     """
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    ledger_file = os.path.join(current_dir, "ledger.json")
+    ledger_file = LEDGER_FILE
     if not os.path.exists(ledger_file):
         return []
     try:
@@ -432,6 +438,25 @@ async def get_ledger_entries():
     except (json.JSONDecodeError, IOError) as e:
         raise HTTPException(status_code=500, detail=f"Failed to read ledger: {str(e)}")
 
+
+@app.get("/audit/{transaction_id}", response_model=AuditDetailResponse)
+async def get_audit_detail(transaction_id: str):
+    """
+    Return a single audit joined with its ledger entry.
+    Both records are read directly via the transaction_id -> offset index.
+    """
+    try:
+        audit = lookup(transaction_id, "audits.json", kind="audit")
+        ledger_entry = lookup(transaction_id, LEDGER_FILE, kind="ledger") if audit else None
+    except (ValueError, IOError) as e:
+        raise HTTPException(status_code=500, detail=f"Failed to read audit: {str(e)}")
+
+    if audit is None:
+        raise HTTPException(status_code=404, detail=f"Audit {transaction_id} not found")
+
+    return AuditDetailResponse(audit=audit, ledger_entry=ledger_entry)
+
+
 @app.get("/")
 async def root():
     return {"message": "Vanguard Protocol API", "status": "operational"}
@@ -3,6 +3,7 @@ import json
 import os
 from datetime import datetime
 from typing import Dict, Any, List
+from record_index import write_records
 
 
 def _hash_reasoning_chain(reasoning_chain: List[str]) -> str:
@@ -27,7 +28,7 @@ def record_audit_trail(audit_data: Dict[str, Any]) -> None:
     This function:
     1. Generates a SHA-256 hash of the reasoning chain
     2. Simulates writing to Azure Confidential Ledger (prints log)
-    3. Saves the full audit record to audits.json
+    3. Saves the full audit record to audits.json and indexes it by transaction_id
     
     This fulfills the "Compliance Void" requirement by creating an
     unchangeable record that can hold up in court or insurance audits.
@@ -73,10 +74,9 @@ def record_audit_trail(audit_data: Dict[str, Any]) -> None:
     # Append new audit record
     audits.append(audit_record)
     
-    # Write back to file
+    # Write back to file and refresh the transaction_id -> offset index
     try:
-        with open(audits_file, 'w', encoding='utf-8') as f:
-            json.dump(audits, f, indent=2, ensure_ascii=False)
+        write_records(audits_file, audits, kind="audit")
     except IOError as e:
         print(f"[ERROR] Failed to write audit trail to {audits_file}: {e}")
         raise
@@ -0,0 +1,212 @@
+import json
+import os
+from typing import Dict, Any, List, Optional, Tuple
+
+
+# Index lives next to this module so it is shared by every working directory
+INDEX_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "record_index.json")
+
+# In-memory copy of the index, refreshed only when the index file itself changes
+_cache: Dict[str, Any] = {"path": None, "stamp": None, "index": {}}
+
+
+def _stamp(path: str) -> Optional[Tuple[int, int]]:
+    """(size, mtime_ns) of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def _load_index() -> Dict[str, Any]:
+    """Return the id -> offset index, re-reading it from disk only if it changed."""
+    stamp = _stamp(INDEX_FILE)
+    if _cache["path"] == INDEX_FILE and _cache["stamp"] == stamp:
+        return _cache["index"]
+
+    index = {}
+    if stamp is not None:
+        try:
+            with open(INDEX_FILE, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (ValueError, IOError):
+            # Corrupted or undecodable index: start empty, lookups will rescan the data files
+            index = {}
+        if not isinstance(index, dict):
+            index = {}
+
+    _cache.update(path=INDEX_FILE, stamp=stamp, index=index)
+    return index
+
+
+def _save_index(index: Dict[str, Any]) -> None:
+    with open(INDEX_FILE, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    _cache.update(path=INDEX_FILE, stamp=_stamp(INDEX_FILE), index=index)
+
+
+def _record_spans(records: List[Dict[str, Any]], key: str, spans: List[Tuple[int, int]]) -> Dict[str, List[int]]:
+    """Map each record's key to its [offset, length]. Later records win on duplicate keys."""
+    offsets = {}
+    for record, span in zip(records, spans):
+        record_id = record.get(key)
+        if record_id:
+            offsets[record_id] = list(span)
+    return offsets
+
+
+def _kind_entry(data_file: str, offsets: Dict[str, List[int]]) -> Dict[str, Any]:
+    """
+    Index entry for one data file. Size and mtime let lookups detect writes that
+    bypassed write_records (or a crash between the data write and the index write).
+    """
+    stamp = _stamp(data_file)
+    return {
+        "file": os.path.abspath(data_file),
+        "size": stamp[0] if stamp else None,
+        "mtime_ns": stamp[1] if stamp else None,
+        "offsets": offsets,
+    }
+
+
+def _update_kind(kind: str, data_file: str, offsets: Dict[str, List[int]]) -> None:
+    index = dict(_load_index())
+    index[kind] = _kind_entry(data_file, offsets)
+    _save_index(index)
+
+
+def write_records(
+    data_file: str,
+    records: List[Dict[str, Any]],
+    kind: str,
+    key: str = "transaction_id",
+) -> None:
+    """
+    Write records as a JSON array and refresh the index for this kind.
+
+    The output is byte-for-byte what json.dump(records, indent=2, ensure_ascii=False)
+    produces, but each record is serialized individually so its byte offset and
+    length are known without re-parsing the file.
+    """
+    spans = []
+    if records:
+        chunks = [b"[\n  "]
+        position = len(chunks[0])
+        for i, record in enumerate(records):
+            if i:
+                chunks.append(b",\n  ")
+                position += 4
+            body = json.dumps(record, indent=2, ensure_ascii=False).replace("\n", "\n  ").encode('utf-8')
+            spans.append((position, len(body)))
+            chunks.append(body)
+            position += len(body)
+        chunks.append(b"\n]")
+        payload = b"".join(chunks)
+    else:
+        payload = b"[]"
+
+    with open(data_file, 'wb') as f:
+        f.write(payload)
+
+    # The record is saved; the index is a derived cache that lookups rebuild if stale
+    try:
+        _update_kind(kind, data_file, _record_spans(records, key, spans))
+    except (ValueError, IOError) as e:
+        print(f"[ERROR] Failed to update record index {INDEX_FILE}: {e}")
+
+
+def _scan_offsets(data_file: str, key: str) -> Dict[str, List[int]]:
+    """
+    Find the byte span of every record in a JSON array file, whatever its formatting.
+    Raises ValueError if the file is not valid UTF-8.
+    """
+    if not os.path.exists(data_file):
+        return {}
+
+    # Read bytes and decode without newline translation so CRLF files keep exact offsets
+    with open(data_file, 'rb') as f:
+        text = f.read().decode('utf-8')
+
+    decoder = json.JSONDecoder()
+    records, spans = [], []
+    pos = text.find('[') + 1
+    byte_pos = len(text[:pos].encode('utf-8'))
+    while 0 < pos < len(text):
+        # Skip separators between array elements, tracking the byte position as we go
+        start = pos
+        while pos < len(text) and text[pos] in " \t\r\n,":
+            pos += 1
+        byte_pos += len(text[start:pos].encode('utf-8'))
+        if pos >= len(text) or text[pos] == ']':
+            break
+        try:
+            record, end = decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            break
+        length = len(text[pos:end].encode('utf-8'))
+        if isinstance(record, dict):
+            records.append(record)
+            spans.append((byte_pos, length))
+        byte_pos += length
+        pos = end
+
+    return _record_spans(records, key, spans)
+
+
+def rebuild_index(data_file: str, kind: str, key: str = "transaction_id") -> None:
+    """Rebuild and persist the index for one kind by scanning its data file."""
+    _update_kind(kind, data_file, _scan_offsets(data_file, key))
+
+
+def _fresh_entry(data_file: str, kind: str, key: str, force: bool = False) -> Dict[str, Any]:
+    """
+    Return the index entry for a kind, rescanning the data file if it changed since
+    the index was written. Rescans are kept in memory only so reads never write to disk.
+    """
+    index = _load_index()
+    entry = index.get(kind)
+    stamp = _stamp(data_file)
+    current = (
+        isinstance(entry, dict)
+        and isinstance(entry.get("offsets"), dict)
+        and entry.get("file") == data_file
+        and (entry.get("size"), entry.get("mtime_ns")) == (stamp or (None, None))
+    )
+    if force or not current:
+        entry = _kind_entry(data_file, _scan_offsets(data_file, key))
+        index[kind] = entry
+    return entry
+
+
+def _read_at(data_file: str, span: List[int]) -> Optional[Dict[str, Any]]:
+    try:
+        with open(data_file, 'rb') as f:
+            f.seek(span[0])
+            return json.loads(f.read(span[1]).decode('utf-8'))
+    except (ValueError, IOError, IndexError):
+        return None
+
+
+def lookup(
+    record_id: str,
+    data_file: str,
+    kind: str,
+    key: str = "transaction_id",
+) -> Optional[Dict[str, Any]]:
+    """
+    Fetch a single record by id with one seek into the data file.
+    Returns None if the id is not present.
+    """
+    data_file = os.path.abspath(data_file)
+    for attempt in range(2):
+        entry = _fresh_entry(data_file, kind, key, force=attempt > 0)
+        span = entry["offsets"].get(record_id)
+        if span is None:
+            return None
+
+        record = _read_at(data_file, span)
+        if record is not None and record.get(key) == record_id:
+            return record
+        # Offsets no longer match the file despite an unchanged stamp; rescan once
+    return None
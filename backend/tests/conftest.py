@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Backend modules import each other flat (e.g. `from notary import ...`), as they do under uvicorn
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
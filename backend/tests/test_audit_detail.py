@@ -0,0 +1,96 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+import record_index
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(record_index, "INDEX_FILE", str(tmp_path / "record_index.json"))
+    monkeypatch.setattr(main, "LEDGER_FILE", str(tmp_path / "ledger.json"))
+    return TestClient(main.app)
+
+
+def _audit(client):
+    response = client.post("/audit", json={
+        "agent_id": "Agent_007",
+        "mission_statement": "Process vendor invoices for IT department",
+        "proposed_action": "Transfer $12,500 to Global Tech Corp",
+        "reasoning_chain": ["Invoice matches the purchase order"],
+    })
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_unknown_transaction_id_is_404(client):
+    _audit(client)
+    assert client.get("/audit/00000000-0000-0000-0000-000000000000").status_code == 404
+
+
+def test_legacy_short_id_is_404(client, tmp_path):
+    (tmp_path / "audits.json").write_text(json.dumps([{"id": "f8d932ea", "decision": "BLOCK"}]))
+    assert client.get("/audit/f8d932ea").status_code == 404
+
+
+def test_ledger_entry_joined_after_commit(client):
+    audit = _audit(client)
+    transaction_id = audit["transaction_id"]
+
+    detail = client.get(f"/audit/{transaction_id}").json()
+    assert detail["audit"]["transaction_id"] == transaction_id
+    assert detail["audit"]["id"] == transaction_id[:8]
+    assert detail["ledger_entry"] is None
+
+    response = client.post("/api/ledger", json={
+        "transaction_id": transaction_id,
+        "agent_id": "Agent_007",
+        "mission_statement": "Process vendor invoices for IT department",
+        "proposed_action": "Transfer $12,500 to Global Tech Corp",
+        "reasoning_chain": ["Invoice matches the purchase order"],
+        "delta_score": audit["delta_score"],
+        "decision": audit["decision"],
+        "audit_mode": audit["audit_mode"],
+        "trust_baseline": audit["trust_baseline"],
+    })
+    assert response.status_code == 200
+
+    detail = client.get(f"/audit/{transaction_id}").json()
+    assert detail["ledger_entry"]["ledger_id"] == response.json()["ledger_id"]
+    assert detail["ledger_entry"]["transaction_id"] == transaction_id
+
+
+def test_undecodable_audits_file_is_500(client, tmp_path):
+    (tmp_path / "audits.json").write_bytes(b'[{"transaction_id": "\xff"}]')
+    response = client.get("/audit/anything")
+    assert response.status_code == 500
+    assert "Failed to read audit" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("corruption", [b"\xff\xfe", b"[]", b"{", b'{"audit": [], "ledger": {"offsets": 1}}'])
+def test_corrupted_index_does_not_break_requests(client, tmp_path, corruption):
+    (tmp_path / "record_index.json").write_bytes(corruption)
+    audit = _audit(client)
+    transaction_id = audit["transaction_id"]
+
+    (tmp_path / "record_index.json").write_bytes(corruption)
+    response = client.post("/api/ledger", json={
+        "transaction_id": transaction_id,
+        "agent_id": "Agent_007",
+        "mission_statement": "Process vendor invoices for IT department",
+        "proposed_action": "Transfer $12,500 to Global Tech Corp",
+        "reasoning_chain": ["Invoice matches the purchase order"],
+        "delta_score": audit["delta_score"],
+        "decision": audit["decision"],
+        "audit_mode": audit["audit_mode"],
+        "trust_baseline": audit["trust_baseline"],
+    })
+    assert response.status_code == 200
+
+    (tmp_path / "record_index.json").write_bytes(corruption)
+    detail = client.get(f"/audit/{transaction_id}")
+    assert detail.status_code == 200
+    assert detail.json()["ledger_entry"]["transaction_id"] == transaction_id
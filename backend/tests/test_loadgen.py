@@ -0,0 +1,92 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+import loadgen
+
+
+def test_percentile_nearest_rank():
+    assert loadgen.percentile([], 50) == 0.0
+    assert loadgen.percentile([0.3], 99) == 0.3
+
+    samples = [float(i) for i in range(100, 0, -1)]  # unsorted on purpose
+    assert loadgen.percentile(samples, 50) == 50.0
+    assert loadgen.percentile(samples, 95) == 95.0
+    assert loadgen.percentile(samples, 99) == 99.0
+    assert loadgen.percentile(samples, 100) == 100.0
+
+
+def test_workload_respects_mix_ratios():
+    workload = loadgen.Workload(
+        {"Synchronous": [], "Asynchronous": []},
+        source="synthetic",
+        sync_ratio=0.25,
+        logs_ratio=0.2,
+        analytics_ratio=0.1,
+        seed=7,
+    )
+    counts = {tier: 0 for tier in loadgen.TIERS}
+    for _ in range(10_000):
+        job = workload.next()
+        counts[job["tier"]] += 1
+        if job["path"] == "/audit":
+            assert loadgen._classify(job["json"]["proposed_action"]) == job["tier"]
+
+    assert counts["/logs"] / 10_000 == pytest.approx(0.2, abs=0.02)
+    assert counts["/analytics"] / 10_000 == pytest.approx(0.1, abs=0.02)
+    audits = counts["Synchronous"] + counts["Asynchronous"]
+    assert counts["Synchronous"] / audits == pytest.approx(0.25, abs=0.02)
+
+
+def test_parse_args_rejects_read_ratios_over_one():
+    with pytest.raises(SystemExit):
+        loadgen.parse_args(["--logs-ratio", "0.7", "--analytics-ratio", "0.4"])
+    with pytest.raises(SystemExit):
+        loadgen.parse_args(["--sync-ratio", "1.5"])
+
+
+def test_summary_marks_failed_tiers():
+    recorder = loadgen.Recorder()
+    recorder.record("/analytics", 0.01, ok=False)
+    recorder.record("/logs", 0.02, ok=True)
+    summary = recorder.summary(elapsed=1.0)
+
+    assert summary["/analytics"]["p50_ms"] is None
+    assert summary["/analytics"]["error_rate"] == 1.0
+    assert summary["/logs"]["p50_ms"] == 20.0
+
+
+def test_run_in_process_leaves_trace_untouched(tmp_path):
+    trace = tmp_path / "audits.json"
+    trace.write_text(json.dumps([
+        {
+            "agent_id": "Agent_007",
+            "mission_statement": "Support customers with refund queries.",
+            "proposed_action": "Transfer $5,000 to personal wallet.",
+            "reasoning_chain": ["step"],
+        },
+        {
+            "agent_id": "Agent_008",
+            "mission_statement": "Summarize weekly analytics.",
+            "proposed_action": "Generate the weekly risk report",
+            "reasoning_chain": ["step"],
+        },
+    ]), encoding="utf-8")
+    before = trace.read_bytes()
+    cwd = os.getcwd()
+
+    args = loadgen.parse_args([
+        "--trace", str(trace), "--requests", "20", "--concurrency", "4",
+        "--logs-ratio", "0.2", "--analytics-ratio", "0", "--seed", "3",
+    ])
+    report = asyncio.run(loadgen.run(args))
+
+    assert sum(stats["requests"] for stats in report["tiers"].values()) == 20
+    assert report["source"] == "replay"
+    assert report["tiers"]["Synchronous"]["errors"] == 0
+    assert report["tiers"]["Asynchronous"]["errors"] == 0
+    assert report["audit_mode_mismatches"] == 0
+    assert trace.read_bytes() == before
+    assert os.getcwd() == cwd
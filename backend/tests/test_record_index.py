@@ -0,0 +1,81 @@
+import json
+import os
+
+import pytest
+
+import record_index
+
+
+@pytest.fixture(autouse=True)
+def isolated_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(record_index, "INDEX_FILE", str(tmp_path / "record_index.json"))
+
+
+def _records():
+    return [
+        {"transaction_id": "x1", "proposed_action": "Transfer € to Müller GmbH", "reasoning_chain": []},
+        {"transaction_id": "x2", "trust_baseline": {}, "nested": {"list": [1, {"deep": []}], "empty": ""}},
+        {"transaction_id": "x3", "text": "line\nbreak \"quoted\" 日本語", "score": 0.73, "flag": None},
+    ]
+
+
+@pytest.mark.parametrize("records", [[], [{}], _records()])
+def test_write_records_matches_json_dump(tmp_path, records):
+    data_file = tmp_path / "audits.json"
+    record_index.write_records(str(data_file), records, kind="audit")
+
+    expected = json.dumps(records, indent=2, ensure_ascii=False).encode("utf-8")
+    assert data_file.read_bytes() == expected
+
+
+def test_lookup_after_write(tmp_path):
+    data_file = str(tmp_path / "audits.json")
+    record_index.write_records(data_file, _records(), kind="audit")
+
+    assert record_index.lookup("x3", data_file, kind="audit") == _records()[2]
+    assert record_index.lookup("missing", data_file, kind="audit") is None
+
+
+@pytest.mark.parametrize("rewrite", [
+    lambda text: json.dumps(json.loads(text)[::-1]),
+    lambda text: text.replace("\n", "\r\n"),
+    lambda text: "  " + text.replace("  ", "\t"),
+])
+def test_lookup_recovers_after_hand_edit(tmp_path, rewrite):
+    data_file = tmp_path / "audits.json"
+    record_index.write_records(str(data_file), _records(), kind="audit")
+    data_file.write_bytes(rewrite(data_file.read_text(encoding="utf-8")).encode("utf-8"))
+
+    for record in _records():
+        assert record_index.lookup(record["transaction_id"], str(data_file), kind="audit") == record
+
+
+def test_lookup_sees_records_written_around_the_index(tmp_path):
+    data_file = tmp_path / "audits.json"
+    records = _records()
+    record_index.write_records(str(data_file), records[:2], kind="audit")
+    # Simulates a crash between the data write and the index write
+    data_file.write_text(json.dumps(records, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    assert record_index.lookup("x3", str(data_file), kind="audit") == records[2]
+
+
+def test_lookup_never_writes_the_index(tmp_path):
+    data_file = tmp_path / "audits.json"
+    data_file.write_text(json.dumps(_records()), encoding="utf-8")
+
+    assert record_index.lookup("x1", str(data_file), kind="audit") == _records()[0]
+    assert not os.path.exists(record_index.INDEX_FILE)
+
+
+def test_write_survives_unwritable_index(tmp_path, monkeypatch, capsys):
+    # A directory in place of the index file makes every index write fail
+    blocked = tmp_path / "blocked"
+    blocked.mkdir()
+    monkeypatch.setattr(record_index, "INDEX_FILE", str(blocked))
+    data_file = str(tmp_path / "audits.json")
+
+    record_index.write_records(data_file, _records(), kind="audit")
+
+    assert "[ERROR]" in capsys.readouterr().out
+    assert record_index.lookup("x2", data_file, kind="audit") == _records()[1]